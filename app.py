@@ -1,23 +1,27 @@
 import os
 from dotenv import load_dotenv
+from functools import lru_cache
 from todo_app import create_app
-from typing import Optional
 
 # Memuat variabel environment dari instance/.env jika ada
-load_dotenv(os.path.join("instance", ".env"))
+# (dilewati saat testing karena environment sudah diatur oleh test)
+ENV_PATH = os.path.join("instance", ".env")
+if os.environ.get("FLASK_ENV") != "testing" and os.path.isfile(ENV_PATH):
+    load_dotenv(ENV_PATH, override=False)
 
 # Membuat aplikasi menggunakan factory pattern
 app = create_app()
 
+@lru_cache(maxsize=1)
 def get_port() -> int:
     """
     Mendapatkan port dari environment variable PORT.
-    Jika tidak ada, gunakan default 5000.
+    Jika tidak ada atau tidak valid, gunakan default 5000.
     """
-    port_str: Optional[str] = os.environ.get("PORT")
-    if port_str and port_str.isdigit():
-        return int(port_str)
-    return 5000
+    try:
+        return int(os.environ.get("PORT", "5000"))
+    except (TypeError, ValueError):
+        return 5000
 
 if __name__ == "__main__":
     # Menjalankan server development Flask
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings, loaded automatically from the working directory.
+Requests are almost entirely database I/O, so gevent workers let each
+process serve many requests while queries are in flight.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+worker_class = "gevent"
+# ProductionConfig divides DB_MAX_CONNECTIONS between this many workers
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+worker_connections = int(os.environ.get("WORKER_CONNECTIONS", 500))
+
+# Tables are created by the release step (python -m todo_app.init_db),
+# not by every worker racing on CREATE TABLE/EXTENSION at boot
+raw_env = ["AUTO_CREATE_TABLES=0"]
+
+
+def post_fork(server, worker):
+    """
+    Make psycopg2 yield to other greenlets while waiting on PostgreSQL.
+    Only applies to gevent workers, which already monkey-patch the standard library.
+    """
+    if server.cfg.worker_class_str != "gevent":
+        return
+
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
@@ -8,6 +8,18 @@ import subprocess
 import os
 
 
+def xdist_args():
+    """
+    Extra pytest arguments to spread the suite across CPU cores.
+    Tests are handed out individually (--dist=load); each worker has its own
+    in-memory database and every test runs in its own SAVEPOINT, so no
+    grouping is needed. Set PYTEST_XDIST=0 to run in a single process.
+    """
+    if os.environ.get("PYTEST_XDIST", "1") == "0":
+        return []
+    return ["-n", "auto", "--dist=load", "-p", "no:cacheprovider"]
+
+
 def run_tests():
     """Run the test suite."""
     print("Running TodoList API tests...")
@@ -22,12 +34,9 @@ def run_tests():
             sys.executable, "-m", "pytest",
             "tests/",
             "-v",
-            "--tb=short"
-        ], capture_output=True, text=True)
-
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
+            "--tb=short",
+            *xdist_args()
+        ])
 
         return result.returncode == 0
 
@@ -49,12 +58,9 @@ def run_specific_test(test_name):
             sys.executable, "-m", "pytest",
             f"tests/test_todos.py::{test_name}",
             "-v",
-            "--tb=short"
-        ], capture_output=True, text=True)
-
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
+            "--tb=short",
+            *xdist_args()
+        ])
 
         return result.returncode == 0
 
@@ -1,39 +1,119 @@
 import pytest
 import os
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
 from todo_app import create_app
 from todo_app.extensions import db
+from todo_app.models import Todo
 
 
-@pytest.fixture(scope="function")
+def enable_sqlite_savepoints(engine):
+    """
+    Let pysqlite emit BEGIN itself so SAVEPOINTs nest inside the outer
+    test transaction instead of committing on RELEASE.
+    """
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+_APP = None
+
+
+def get_test_app():
+    """
+    Build the test app once per process and reuse it.
+    Each pytest-xdist worker gets its own app and in-memory database.
+    """
+    global _APP
+    if _APP is None:
+        os.environ["SECRET_KEY"] = "test-secret-key"
+        os.environ["FLASK_ENV"] = "testing"
+        app = create_app("testing")
+        app.config.update({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        })
+
+        with app.app_context():
+            enable_sqlite_savepoints(db.engine)
+            db.create_all()
+
+        _APP = app
+    return _APP
+
+
+@pytest.fixture(scope="session")
 def app():
     """Create and configure a test app instance."""
-    os.environ["SECRET_KEY"] = "test-secret-key"
-    app = create_app()
-    app.config.update({
-        "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
-    })
-
+    app = get_test_app()
     with app.app_context():
-        db.create_all()
         yield app
-        db.session.remove()
-        db.drop_all()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def client(app):
     """A test client for the app."""
     return app.test_client()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def session(app, monkeypatch):
+    """
+    Run each test inside an outer transaction and a SAVEPOINT.
+    Commits from the app only release the savepoint, and everything is
+    rolled back when the test finishes. Autoflush is off; seeding and
+    commits flush explicitly.
+    """
+    connection = db.engine.connect()
+    transaction = connection.begin()
+
+    test_session = scoped_session(
+        sessionmaker(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            autoflush=False,
+        )
+    )
+    monkeypatch.setattr(db, "session", test_session)
+
+    yield test_session
+
+    test_session.remove()
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture(scope="function")
-def session(app):
-    """Create a new database session for a test."""
-    with app.app_context():
-        db.session.begin_nested()
+def seed_todos(session):
+    """
+    Insert todo rows directly through the ORM, bypassing HTTP and validation.
+    Rows are rolled back together with the test's savepoint.
+    """
+    def seed(rows):
+        session.bulk_insert_mappings(Todo, rows)
+        session.flush()
+
+    return seed
+
+
+@pytest.fixture(scope="function")
+def query_counter(app):
+    """
+    Record the SQL statements the app sends to the database.
+    Transaction control (BEGIN, SAVEPOINT, RELEASE, ...) is not counted.
+    """
+    statements = []
 
-        yield db.session
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            statements.append(statement)
 
-        db.session.rollback()
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
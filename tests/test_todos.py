@@ -1,18 +1,18 @@
 import pytest
-import json
+import types
 from datetime import datetime, date
 from todo_app.models import Todo
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_todo_data():
-    """Sample data for creating a todo."""
-    return {
+    """Sample data for creating a todo (read-only, shared across tests)."""
+    return types.MappingProxyType({
         "judul": "Test Todo",
         "prioritas": "High",
         "status": False,
         "deadline": "2025-12-31"
-    }
+    })
 
 
 class TestTodoRoutes:
@@ -23,7 +23,7 @@ class TestTodoRoutes:
         response = client.get("/api/todos/")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 0
         assert data["data"] == []
@@ -31,53 +31,49 @@ class TestTodoRoutes:
 
     def test_create_todo_success(self, client, sample_todo_data):
         """Test creating a todo successfully."""
-        response = client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
+        response = client.post("/api/todos/", json=dict(sample_todo_data))
         assert response.status_code == 201
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "id" in data
         assert data["judul"] == sample_todo_data["judul"]
         assert data["prioritas"] == sample_todo_data["prioritas"]
         assert data["status"] == sample_todo_data["status"]
         assert data["deadline"] == sample_todo_data["deadline"]
 
+    def test_create_todo_strips_whitespace(self, client):
+        """Test that string fields are trimmed before the todo is saved."""
+        response = client.post("/api/todos/", json={"judul": "  Padded Title  "})
+        assert response.status_code == 201
+
+        data = response.get_json()
+        assert data["judul"] == "Padded Title"
+
     def test_create_todo_duplicate_title(self, client, sample_todo_data):
         """Test creating a todo with duplicate title."""
         # Create first todo
-        client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
+        client.post("/api/todos/", json=dict(sample_todo_data))
 
         # Try to create duplicate
-        response = client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
-        assert response.status_code == 400
+        response = client.post("/api/todos/", json=dict(sample_todo_data))
+        assert response.status_code == 409
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "message" in data
         assert "sudah ada" in data["message"]
 
+        # The failed insert is rolled back and the original todo remains
+        list_response = client.get("/api/todos/")
+        assert list_response.get_json()["count"] == 1
+
     def test_create_todo_invalid_data(self, client):
         """Test creating a todo with invalid data."""
         invalid_data = {"judul": ""}  # Empty title
 
-        response = client.post(
-            "/api/todos/",
-            data=json.dumps(invalid_data),
-            content_type="application/json"
-        )
+        response = client.post("/api/todos/", json=invalid_data)
         assert response.status_code == 400
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "judul" in data
 
     def test_create_todo_no_data(self, client):
@@ -86,26 +82,35 @@ class TestTodoRoutes:
         assert response.status_code == 400
 
         # Our middleware converts the error to JSON response
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is False
         assert "Invalid JSON format" in data["message"] or "No input provided" in data["message"]
 
-    def test_get_todo_by_id(self, client, sample_todo_data):
-        """Test getting a todo by ID."""
-        # Create a todo first
-        create_response = client.post(
+    def test_create_todo_malformed_json(self, client):
+        """Test creating a todo with a body that is not valid JSON."""
+        response = client.post(
             "/api/todos/",
-            data=json.dumps(sample_todo_data),
+            data="{judul: ",
             content_type="application/json"
         )
-        create_data = json.loads(create_response.data)
+        assert response.status_code == 400
+
+        data = response.get_json()
+        assert data["success"] is False
+        assert data["message"] == "Invalid JSON format."
+
+    def test_get_todo_by_id(self, client, sample_todo_data):
+        """Test getting a todo by ID."""
+        # Create a todo first
+        create_response = client.post("/api/todos/", json=dict(sample_todo_data))
+        create_data = create_response.get_json()
         todo_id = create_data["id"]
 
         # Get the todo
         response = client.get(f"/api/todos/{todo_id}")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["id"] == todo_id
         assert data["judul"] == sample_todo_data["judul"]
 
@@ -117,68 +122,56 @@ class TestTodoRoutes:
     def test_update_todo_success(self, client, sample_todo_data):
         """Test updating a todo successfully."""
         # Create a todo first
-        create_response = client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
-        create_data = json.loads(create_response.data)
+        create_response = client.post("/api/todos/", json=dict(sample_todo_data))
+        create_data = create_response.get_json()
         todo_id = create_data["id"]
 
         # Update the todo
         update_data = {"judul": "Updated Title", "status": True}
-        response = client.put(
-            f"/api/todos/{todo_id}",
-            data=json.dumps(update_data),
-            content_type="application/json"
-        )
+        response = client.put(f"/api/todos/{todo_id}", json=update_data)
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["judul"] == "Updated Title"
         assert data["status"] is True
 
+    def test_update_todo_duplicate_title(self, client, sample_todo_data):
+        """Test renaming a todo to a title that is already taken."""
+        client.post("/api/todos/", json=dict(sample_todo_data))
+        other = client.post("/api/todos/", json={"judul": "Other Todo"}).get_json()
+
+        response = client.put(f"/api/todos/{other['id']}", json={"judul": sample_todo_data["judul"]})
+        assert response.status_code == 409
+
+        # The failed update is rolled back
+        unchanged = client.get(f"/api/todos/{other['id']}").get_json()
+        assert unchanged["judul"] == "Other Todo"
+
     def test_update_todo_no_data(self, client, sample_todo_data):
         """Test updating a todo with no data."""
         # Create a todo first
-        create_response = client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
-        create_data = json.loads(create_response.data)
+        create_response = client.post("/api/todos/", json=dict(sample_todo_data))
+        create_data = create_response.get_json()
         todo_id = create_data["id"]
 
         # Try to update with empty data
-        response = client.put(
-            f"/api/todos/{todo_id}",
-            data=json.dumps({}),
-            content_type="application/json"
-        )
+        response = client.put(f"/api/todos/{todo_id}", json={})
         assert response.status_code == 400
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "message" in data
 
     def test_update_todo_not_found(self, client):
         """Test updating a non-existent todo."""
         update_data = {"judul": "Updated Title"}
-        response = client.put(
-            "/api/todos/999",
-            data=json.dumps(update_data),
-            content_type="application/json"
-        )
+        response = client.put("/api/todos/999", json=update_data)
         assert response.status_code == 404
 
     def test_delete_todo_success(self, client, sample_todo_data):
         """Test deleting a todo successfully."""
         # Create a todo first
-        create_response = client.post(
-            "/api/todos/",
-            data=json.dumps(sample_todo_data),
-            content_type="application/json"
-        )
-        create_data = json.loads(create_response.data)
+        create_response = client.post("/api/todos/", json=dict(sample_todo_data))
+        create_data = create_response.get_json()
         todo_id = create_data["id"]
 
         # Delete the todo
@@ -194,7 +187,7 @@ class TestTodoRoutes:
         response = client.delete("/api/todos/999")
         assert response.status_code == 404
 
-    def test_search_todos_by_keyword(self, client):
+    def test_search_todos_by_keyword(self, client, seed_todos):
         """Test searching todos by keyword."""
         # Create multiple todos
         todos_data = [
@@ -203,22 +196,17 @@ class TestTodoRoutes:
             {"judul": "Learn JavaScript", "prioritas": "Low", "status": True},
         ]
 
-        for todo_data in todos_data:
-            client.post(
-                "/api/todos/",
-                data=json.dumps(todo_data),
-                content_type="application/json"
-            )
+        seed_todos(todos_data)
 
         # Search for "Learn"
         response = client.get("/api/todos/search?q=Learn")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 3
 
-    def test_search_todos_by_priority(self, client):
+    def test_search_todos_by_priority(self, client, seed_todos):
         """Test searching todos by priority."""
         # Create todos with different priorities
         todos_data = [
@@ -227,23 +215,18 @@ class TestTodoRoutes:
             {"judul": "Low Priority Task", "prioritas": "Low", "status": False},
         ]
 
-        for todo_data in todos_data:
-            client.post(
-                "/api/todos/",
-                data=json.dumps(todo_data),
-                content_type="application/json"
-            )
+        seed_todos(todos_data)
 
         # Search for High priority
         response = client.get("/api/todos/search?prioritas=High")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 1
         assert data["data"][0]["prioritas"] == "High"
 
-    def test_search_todos_by_status(self, client):
+    def test_search_todos_by_status(self, client, seed_todos):
         """Test searching todos by status."""
         # Create todos with different statuses
         todos_data = [
@@ -252,67 +235,50 @@ class TestTodoRoutes:
             {"judul": "Pending Task 2", "prioritas": "Low", "status": False},
         ]
 
-        for todo_data in todos_data:
-            client.post(
-                "/api/todos/",
-                data=json.dumps(todo_data),
-                content_type="application/json"
-            )
+        seed_todos(todos_data)
 
         # Search for completed tasks
         response = client.get("/api/todos/search?status=selesai")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 1
         assert data["data"][0]["status"] is True
 
-    def test_search_todos_by_deadline_range(self, client):
+    def test_search_todos_by_deadline_range(self, client, seed_todos):
         """Test searching todos by deadline range."""
         # Create todos with different deadlines
         todos_data = [
-            {"judul": "Task 1", "prioritas": "High", "status": False, "deadline": "2025-01-15"},
-            {"judul": "Task 2", "prioritas": "Medium", "status": False, "deadline": "2025-06-15"},
-            {"judul": "Task 3", "prioritas": "Low", "status": False, "deadline": "2025-12-15"},
+            {"judul": "Task 1", "prioritas": "High", "status": False, "deadline": date(2025, 1, 15)},
+            {"judul": "Task 2", "prioritas": "Medium", "status": False, "deadline": date(2025, 6, 15)},
+            {"judul": "Task 3", "prioritas": "Low", "status": False, "deadline": date(2025, 12, 15)},
         ]
 
-        for todo_data in todos_data:
-            client.post(
-                "/api/todos/",
-                data=json.dumps(todo_data),
-                content_type="application/json"
-            )
+        seed_todos(todos_data)
 
         # Search for tasks between 2025-03-01 and 2025-09-01
         response = client.get("/api/todos/search?deadline_from=2025-03-01&deadline_to=2025-09-01")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 1
         assert data["data"][0]["judul"] == "Task 2"
 
-    def test_list_todos_pagination(self, client):
+    def test_list_todos_pagination(self, client, seed_todos):
         """Test pagination in list todos."""
         # Create multiple todos
-        for i in range(15):
-            todo_data = {
-                "judul": f"Todo {i+1}",
-                "prioritas": "High",
-                "status": False
-            }
-            client.post(
-                "/api/todos/",
-                data=json.dumps(todo_data),
-                content_type="application/json"
-            )
+        seed_todos([
+            {"judul": f"Todo {i+1}", "prioritas": "High", "status": False}
+            for i in range(15)
+        ])
 
         # Get first page with 10 items per page
         response = client.get("/api/todos/?page=1&per_page=10")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["success"] is True
         assert data["count"] == 10
         assert data["pagination"]["page"] == 1
@@ -327,5 +293,151 @@ class TestTodoRoutes:
         response = client.get("/health")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["status"] == "ok"
+
+    def test_list_todos_page_past_end(self, client, seed_todos):
+        """Test that a page past the end still reports the total."""
+        seed_todos([
+            {"judul": f"Todo {i+1}", "prioritas": "High", "status": False}
+            for i in range(3)
+        ])
+
+        response = client.get("/api/todos/?page=5&per_page=2")
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["count"] == 0
+        assert data["pagination"]["total"] == 3
+        assert data["pagination"]["pages"] == 2
+        assert data["pagination"]["has_prev"] is True
+
+    def test_list_todos_cursor_pagination(self, client, seed_todos):
+        """Test keyset pagination with the cursor from the previous page."""
+        seed_todos([
+            {"judul": f"Todo {i+1}", "prioritas": "High", "status": False}
+            for i in range(15)
+        ])
+
+        first = client.get("/api/todos/?per_page=10").get_json()
+        next_cursor = first["pagination"]["next_cursor"]
+        assert next_cursor is not None
+
+        response = client.get(f"/api/todos/?per_page=10&cursor={next_cursor}")
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["count"] == 5
+        assert data["pagination"]["has_next"] is False
+        assert data["pagination"]["next_cursor"] is None
+        assert data["pagination"]["total"] is None
+
+        first_ids = {todo["id"] for todo in first["data"]}
+        second_ids = {todo["id"] for todo in data["data"]}
+        assert first_ids.isdisjoint(second_ids)
+        assert len(first_ids | second_ids) == 15
+
+    def test_list_todos_invalid_cursor(self, client):
+        """Test listing todos with a malformed cursor."""
+        response = client.get("/api/todos/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+        data = response.get_json()
+        assert data["success"] is False
+
+    def test_search_todos_invalid_deadline(self, client):
+        """Test searching todos with a malformed deadline filter."""
+        response = client.get("/api/todos/search?deadline_from=31-12-2025")
+        assert response.status_code == 400
+
+        data = response.get_json()
+        assert data["success"] is False
+        assert data["message"] == "Invalid date format."
+
+    def test_create_todo_invalid_content_type(self, client):
+        """Test creating a todo with a non-JSON content type."""
+        response = client.post("/api/todos/", data="judul=Test", content_type="text/plain")
+        assert response.status_code == 400
+
+        data = response.get_json()
+        assert data["success"] is False
+        assert "content type" in data["message"]
+
+    def test_list_todos_conditional_get(self, client, sample_todo_data):
+        """Test that list responses carry an ETag and honour If-None-Match."""
+        client.post("/api/todos/", json=dict(sample_todo_data))
+
+        response = client.get("/api/todos/")
+        etag = response.headers["ETag"]
+
+        cached = client.get("/api/todos/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        client.post("/api/todos/", json={"judul": "Another Todo"})
+        changed = client.get("/api/todos/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.get_json()["count"] == 2
+
+    def test_list_todos_conditional_get_after_update(self, client, sample_todo_data):
+        """Test that updating a listed todo invalidates the list ETag, even within the same second."""
+        todo_id = client.post("/api/todos/", json=dict(sample_todo_data)).get_json()["id"]
+
+        etag = client.get("/api/todos/").headers["ETag"]
+
+        client.put(f"/api/todos/{todo_id}", json={"status": True})
+        changed = client.get("/api/todos/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.get_json()["data"][0]["status"] is True
+
+    def test_get_todo_conditional_get(self, client, sample_todo_data):
+        """Test that a single todo honours If-None-Match until it changes."""
+        todo_id = client.post("/api/todos/", json=dict(sample_todo_data)).get_json()["id"]
+
+        response = client.get(f"/api/todos/{todo_id}")
+        etag = response.headers["ETag"]
+
+        cached = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        client.put(f"/api/todos/{todo_id}", json={"status": True})
+        changed = client.get(f"/api/todos/{todo_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.get_json()["status"] is True
+
+    def test_list_endpoints_query_count(self, client, seed_todos, query_counter):
+        """Test that list and search run a fixed number of queries, in page and cursor mode."""
+        seed_todos([
+            {"judul": f"Todo {i+1}", "prioritas": "High", "status": False}
+            for i in range(15)
+        ])
+        query_counter.clear()
+
+        # Page mode: list version lookup, then rows and total via COUNT(*) OVER ()
+        response = client.get("/api/todos/?per_page=10")
+        assert response.status_code == 200
+        assert len(query_counter) == 2
+        next_cursor = response.get_json()["pagination"]["next_cursor"]
+
+        # A matching ETag is answered from the list version alone
+        query_counter.clear()
+        response = client.get("/api/todos/?per_page=10", headers={"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == 304
+        assert len(query_counter) == 1
+
+        # Cursor mode: list version lookup and one keyset query, no count
+        query_counter.clear()
+        response = client.get(f"/api/todos/?per_page=10&cursor={next_cursor}")
+        assert response.status_code == 200
+        assert response.get_json()["count"] == 5
+        assert len(query_counter) == 2
+
+        query_counter.clear()
+        response = client.get("/api/todos/search?prioritas=High&per_page=10")
+        assert response.status_code == 200
+        assert len(query_counter) == 1
+
+        query_counter.clear()
+        response = client.get(f"/api/todos/search?prioritas=High&per_page=10&cursor={next_cursor}")
+        assert response.status_code == 200
+        assert len(query_counter) == 1
@@ -1,15 +1,16 @@
 from flask import Flask
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_cors import CORS
 from .extensions import db
 from .todos.routes import bp as todos_bp
 from .config import get_config
-from .api_docs import api
+from .json_provider import OrjsonProvider
 import os
 import logging
 from typing import Optional
 
+# Root logging is configured once per process, not on every create_app()
+_LOGGING_CONFIGURED = False
+
 
 def create_app(config_object: Optional[str] = None) -> Flask:
     """
@@ -25,23 +26,31 @@ def create_app(config_object: Optional[str] = None) -> Flask:
     else:
         config_class = get_config()
 
+    config_class.init()
     app.config.from_object(config_class)
 
-    # Initialize rate limiter
-    default_limits = app.config.get("RATELIMIT_DEFAULT")
-    if default_limits is None:
-        limiter = Limiter(
-            app=app,
-            key_func=get_remote_address,
-            storage_uri=app.config.get("RATELIMIT_STORAGE_URL", "memory://")
-        )
-    else:
-        limiter = Limiter(
-            app=app,
-            key_func=get_remote_address,
-            default_limits=[default_limits] if isinstance(default_limits, str) else default_limits,
-            storage_uri=app.config.get("RATELIMIT_STORAGE_URL", "memory://")
-        )
+    # Use orjson for JSON requests and responses
+    app.json = OrjsonProvider(app)
+
+    # Initialize rate limiter (imported lazily, skipped when disabled)
+    if app.config.get("RATELIMIT_ENABLED", True):
+        from flask_limiter import Limiter
+        from flask_limiter.util import get_remote_address
+
+        default_limits = app.config.get("RATELIMIT_DEFAULT")
+        if default_limits is None:
+            limiter = Limiter(
+                app=app,
+                key_func=get_remote_address,
+                storage_uri=app.config.get("RATELIMIT_STORAGE_URL", "memory://")
+            )
+        else:
+            limiter = Limiter(
+                app=app,
+                key_func=get_remote_address,
+                default_limits=[default_limits] if isinstance(default_limits, str) else default_limits,
+                storage_uri=app.config.get("RATELIMIT_STORAGE_URL", "memory://")
+            )
 
     # Initialize CORS
     cors_origins = app.config.get("CORS_ORIGINS")
@@ -58,10 +67,13 @@ def create_app(config_object: Optional[str] = None) -> Flask:
     if log_format is None:
         log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-    logging.basicConfig(
-        level=log_level,
-        format=log_format
-    )
+    global _LOGGING_CONFIGURED
+    if not _LOGGING_CONFIGURED:
+        logging.basicConfig(
+            level=log_level,
+            format=log_format
+        )
+        _LOGGING_CONFIGURED = True
     app.logger.setLevel(log_level)
 
     # Initialize database extension
@@ -75,7 +87,10 @@ def create_app(config_object: Optional[str] = None) -> Flask:
     app.register_blueprint(todos_bp, url_prefix="/api/todos")
 
     # Initialize API documentation
-    api.init_app(app)
+    if app.config.get("ENABLE_SWAGGER", True):
+        from .api_docs import get_api
+
+        get_api().init_app(app)
 
     # Health check endpoint
     @app.route("/health")
@@ -86,8 +101,14 @@ def create_app(config_object: Optional[str] = None) -> Flask:
         return {"status": "ok"}
 
     # Auto create tables on first run (only for development,
-    # use migrations in production)
-    with app.app_context():
-        db.create_all()
+    # use migrations in production). Tests create their own schema, and
+    # under gunicorn the release step creates it (AUTO_CREATE_TABLES=0 in workers).
+    if (
+        not app.config.get("TESTING")
+        and os.environ.get("FLASK_ENV") != "testing"
+        and os.environ.get("AUTO_CREATE_TABLES", "1") != "0"
+    ):
+        with app.app_context():
+            db.create_all()
 
     return app
@@ -1,20 +1,15 @@
 """
 API Documentation setup using Flask-RESTX
 """
-from flask_restx import Api, fields
+from flask_restx import Api, Namespace, fields
+from typing import Optional
 from .constants import RESPONSE_SUCCESS, RESPONSE_MESSAGE, RESPONSE_DATA, RESPONSE_COUNT, RESPONSE_PAGINATION
 
-# Create API instance
-api = Api(
-    title="Todo API",
-    version="1.0",
-    description="A RESTful API for managing todos with full CRUD operations",
-    doc="/docs",  # Swagger UI will be available at /docs
-    prefix="/api"
-)
+# Define namespaces
+todos_ns = Namespace('todos', description='Todo operations')
 
 # Define models for documentation
-todo_model = api.model('Todo', {
+todo_model = todos_ns.model('Todo', {
     'id': fields.Integer(readonly=True, description='The todo unique identifier'),
     'judul': fields.String(required=True, description='The todo title', example='Learn Python'),
     'status': fields.Boolean(description='Todo completion status', example=False),
@@ -24,16 +19,17 @@ todo_model = api.model('Todo', {
     'updated_at': fields.DateTime(readonly=True, description='Last update timestamp')
 })
 
-pagination_model = api.model('Pagination', {
-    'page': fields.Integer(description='Current page number'),
+pagination_model = todos_ns.model('Pagination', {
+    'page': fields.Integer(description='Current page number (null in cursor mode)'),
     'per_page': fields.Integer(description='Items per page'),
-    'total': fields.Integer(description='Total number of items'),
-    'pages': fields.Integer(description='Total number of pages'),
+    'total': fields.Integer(description='Total number of items (null in cursor mode)'),
+    'pages': fields.Integer(description='Total number of pages (null in cursor mode)'),
     'has_next': fields.Boolean(description='Whether there is a next page'),
-    'has_prev': fields.Boolean(description='Whether there is a previous page')
+    'has_prev': fields.Boolean(description='Whether there is a previous page'),
+    'next_cursor': fields.String(description='Cursor for the next page (keyset pagination)')
 })
 
-response_model = api.model('Response', {
+response_model = todos_ns.model('Response', {
     RESPONSE_SUCCESS: fields.Boolean(description='Operation success status'),
     RESPONSE_MESSAGE: fields.String(description='Response message'),
     RESPONSE_DATA: fields.Raw(description='Response data'),
@@ -41,10 +37,22 @@ response_model = api.model('Response', {
     RESPONSE_PAGINATION: fields.Nested(pagination_model, description='Pagination information')
 })
 
-# Define namespaces
-todos_ns = api.namespace('todos', description='Todo operations')
+# API instance is created lazily, only when Swagger docs are enabled
+_api: Optional[Api] = None
+
 
-# Add models to namespace
-todos_ns.models['Todo'] = todo_model
-todos_ns.models['Response'] = response_model
-todos_ns.models['Pagination'] = pagination_model
+def get_api() -> Api:
+    """
+    Get the shared Api instance, creating it on first use.
+    """
+    global _api
+    if _api is None:
+        _api = Api(
+            title="Todo API",
+            version="1.0",
+            description="A RESTful API for managing todos with full CRUD operations",
+            doc="/docs",  # Swagger UI will be available at /docs
+            prefix="/api"
+        )
+        _api.add_namespace(todos_ns)
+    return _api
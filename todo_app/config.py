@@ -23,6 +23,7 @@ class Config:
     MAX_PER_PAGE = 100
 
     # Rate limiting (if using Flask-Limiter)
+    RATELIMIT_ENABLED = True
     RATELIMIT_DEFAULT = "100 per hour"
     RATELIMIT_STORAGE_URL = "memory://"
 
@@ -37,6 +38,7 @@ class Config:
     API_TITLE = "Todo API"
     API_VERSION = "v1"
     API_DESCRIPTION = "A RESTful API for managing todos"
+    ENABLE_SWAGGER = True
 
     # Security headers
     SECURITY_HEADERS = {
@@ -47,6 +49,12 @@ class Config:
         'Content-Security-Policy': "default-src 'self'"
     }
 
+    @classmethod
+    def init(cls) -> None:
+        """
+        Hook to resolve environment-dependent settings before loading.
+        """
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -72,8 +80,12 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
     # Disable rate limiting in tests
+    RATELIMIT_ENABLED = False
     RATELIMIT_DEFAULT = None
 
+    # Skip Swagger UI setup in tests
+    ENABLE_SWAGGER = False
+
     # Allow all origins in testing
     CORS_ORIGINS = ["*"]
 
@@ -84,26 +96,45 @@ class ProductionConfig(Config):
     DEBUG = False
     LOG_LEVEL = "WARNING"
 
-    # Ensure SECRET_KEY is set in production
-    @property
-    def SECRET_KEY(self):
+    # Resolved from the environment by init()
+    SECRET_KEY = None
+    SQLALCHEMY_DATABASE_URI = None
+
+    # Keep database connections open across requests; sized by init()
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    @classmethod
+    def init(cls) -> None:
+        """
+        Resolve SECRET_KEY and DATABASE_URL once, before the config is loaded.
+        """
+        # Ensure SECRET_KEY is set in production
         secret_key = os.environ.get("SECRET_KEY")
         if not secret_key:
             raise ValueError("SECRET_KEY environment variable must be set in production")
-        return secret_key
 
-    # Ensure DATABASE_URL is set in production
-    @property
-    def SQLALCHEMY_DATABASE_URI(self):
+        # Ensure DATABASE_URL is set in production
         database_url = os.environ.get("DATABASE_URL")
         if not database_url:
             raise ValueError("DATABASE_URL environment variable must be set in production")
 
         # Fix for Railway postgres:// -> postgresql://
         if database_url.startswith("postgres://"):
-            database_url = database_url.replace("postgres://", "postgresql://", 1)
-
-        return database_url
+            database_url = "postgresql://" + database_url[len("postgres://"):]
+
+        cls.SECRET_KEY = secret_key
+        cls.SQLALCHEMY_DATABASE_URI = database_url
+
+        # Split the connection budget (PostgreSQL allows 100 by default) across
+        # gunicorn workers; WEB_CONCURRENCY defaults to 4 as in gunicorn.conf.py
+        workers = max(int(os.environ.get("WEB_CONCURRENCY", 4)), 1)
+        per_worker = max(int(os.environ.get("DB_MAX_CONNECTIONS", 80)) // workers, 2)
+        cls.SQLALCHEMY_ENGINE_OPTIONS = {
+            "pool_size": per_worker // 2,
+            "max_overflow": per_worker - per_worker // 2,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+        }
 
     # Stricter rate limiting in production
     RATELIMIT_DEFAULT = "100 per hour"
@@ -4,7 +4,7 @@ Centralized definitions for messages, values, and limits to ensure consistency.
 """
 
 # Priority levels
-PRIORITIES = ["High", "Medium", "Low"]
+PRIORITIES = frozenset(("High", "Medium", "Low"))
 
 # Status values (for clarity, though stored as bool in DB)
 STATUS_COMPLETED = True
@@ -16,19 +16,17 @@ DEFAULT_PER_PAGE = 10
 MAX_PER_PAGE = 100
 
 # HTTP Status Codes
-HTTP_STATUS = {
-    "OK": 200,
-    "CREATED": 201,
-    "NO_CONTENT": 204,
-    "BAD_REQUEST": 400,
-    "UNAUTHORIZED": 401,
-    "FORBIDDEN": 403,
-    "NOT_FOUND": 404,
-    "METHOD_NOT_ALLOWED": 405,
-    "CONFLICT": 409,
-    "UNPROCESSABLE_ENTITY": 422,
-    "INTERNAL_SERVER_ERROR": 500,
-}
+HTTP_OK = 200
+HTTP_CREATED = 201
+HTTP_NO_CONTENT = 204
+HTTP_BAD_REQUEST = 400
+HTTP_UNAUTHORIZED = 401
+HTTP_FORBIDDEN = 403
+HTTP_NOT_FOUND = 404
+HTTP_METHOD_NOT_ALLOWED = 405
+HTTP_CONFLICT = 409
+HTTP_UNPROCESSABLE_ENTITY = 422
+HTTP_INTERNAL_SERVER_ERROR = 500
 
 # Error messages
 ERROR_MESSAGES = {
@@ -41,6 +39,7 @@ ERROR_MESSAGES = {
     "todo_not_found": "Todo not found.",
     "invalid_page": "Invalid page number.",
     "invalid_per_page": "Invalid per_page value.",
+    "invalid_cursor": "Invalid pagination cursor.",
     "invalid_date": "Invalid date format.",
     "validation_error": "Validation failed.",
     "database_error": "Database operation failed.",
@@ -0,0 +1,53 @@
+"""
+Create missing database tables without building the Flask app.
+Run once per deploy (the Procfile release step) before the web workers start:
+
+    python -m todo_app.init_db
+"""
+import logging
+import os
+from typing import Optional
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import URL
+from .config import get_config
+from .extensions import db
+from . import models  # noqa: F401  (registers the tables on db.metadata)
+
+logger = logging.getLogger(__name__)
+
+# Same folder Flask uses as app.instance_path for this package
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance")
+
+
+def resolve_database_uri(uri: str) -> URL:
+    """
+    Resolve relative SQLite paths against the instance folder,
+    matching what Flask-SQLAlchemy does for the app.
+    """
+    url = make_url(uri)
+    if url.drivername.startswith("sqlite") and url.database and url.database != ":memory:":
+        if not os.path.isabs(url.database):
+            os.makedirs(INSTANCE_PATH, exist_ok=True)
+            url = url.set(database=os.path.join(INSTANCE_PATH, url.database))
+    return url
+
+
+def init_db(config_name: Optional[str] = None) -> None:
+    """
+    Create all tables for the configured database using a standalone engine.
+    """
+    config_class = get_config(config_name)
+    config_class.init()
+
+    engine = create_engine(resolve_database_uri(config_class.SQLALCHEMY_DATABASE_URI))
+    try:
+        db.metadata.create_all(engine)
+    finally:
+        engine.dispose()
+
+    logger.info("Database tables created")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_db()
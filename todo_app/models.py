@@ -1,7 +1,17 @@
 from .extensions import db
-from datetime import datetime, timezone
+from datetime import date, datetime
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
 from typing import Optional
 
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds, so bound values are
+# stored the same way to keep comparisons (e.g. keyset cursors) consistent
+Timestamp = db.DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
 
 class Todo(db.Model):
     """
@@ -10,21 +20,67 @@ class Todo(db.Model):
 
     __tablename__ = "todos"
 
-    id = db.Column(db.Integer, primary_key=True)
-    judul = db.Column(db.String(255), nullable=False, unique=True)  # Title of the task
-    status = db.Column(db.Boolean, default=False, nullable=False)  # Completed or not
-    prioritas = db.Column(
-        db.String(10), default="Medium", nullable=False
+    id: Mapped[int] = mapped_column(primary_key=True)
+    judul: Mapped[str] = mapped_column(db.String(255))  # Title of the task (unique, see below)
+    status: Mapped[bool] = mapped_column(default=False)  # Completed or not
+    prioritas: Mapped[str] = mapped_column(
+        db.String(10), default="Medium"
     )  # Priority: High/Medium/Low
-    deadline = db.Column(db.Date, nullable=True)  # Deadline date
+    deadline: Mapped[Optional[date]] = mapped_column()  # Deadline date
+
+    # Timestamps are set by the database
+    created_at: Mapped[datetime] = mapped_column(Timestamp, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        Timestamp, server_default=func.now(), onupdate=func.now()
+    )
 
-    created_at = db.Column(
-        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    # Indexes matching the list/search ordering (created_at desc, id) and filters
+    __table_args__ = (
+        db.Index("ix_todos_judul", "judul", unique=True),
+        db.Index("ix_todos_created_at_id", created_at.desc(), id.desc()),
+        db.Index("ix_todos_prioritas_created_at", "prioritas", "created_at"),
+        db.Index("ix_todos_status_created_at", "status", "created_at"),
+        db.Index("ix_todos_deadline", "deadline"),
+        # Combined status/priority/deadline search filters, newest first
+        db.Index("ix_todos_search", "status", "prioritas", "deadline", created_at.desc()),
+        # Trigram index so the title search (ILIKE '%q%') can avoid a full scan
+        db.Index(
+            "ix_todos_judul_trgm", "judul",
+            postgresql_using="gin",
+            postgresql_ops={"judul": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
-    updated_at = db.Column(db.DateTime, onupdate=lambda: datetime.now(timezone.utc))
 
     def __repr__(self) -> str:
         """
         String representation for debugging.
         """
         return f"<Todo {self.judul}>"
+
+
+class TodoListVersion(db.Model):
+    """
+    Single-row counter bumped by every todo write.
+    Used as the list ETag, so unchanged lists can be answered without a query.
+    """
+
+    __tablename__ = "todo_list_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
+
+
+# Seed the counter row when the table is created
+event.listen(
+    TodoListVersion.__table__,
+    "after_create",
+    lambda target, connection, **kw: connection.execute(target.insert().values(id=1, version=0)),
+)
+
+
+# The trigram index needs the pg_trgm extension on PostgreSQL
+event.listen(
+    Todo.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
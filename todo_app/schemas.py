@@ -1,30 +1,29 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
-from marshmallow import fields, validates, ValidationError, post_dump
+from marshmallow import fields, validates, ValidationError
 from .models import Todo
 from .constants import PRIORITIES, ERROR_MESSAGES
-import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List
 
 
 class TodoSchema(SQLAlchemyAutoSchema):
     """
-    Schema for serialization and validation of Todo.
-    Fields are ordered with id first and timestamps last.
+    Schema for validation of Todo input.
+    Loads plain dicts; it is not bound to a session, so one instance can be shared.
     """
 
     class Meta:
         model = Todo
-        load_instance = True
-        sqla_session = None
-        ordered = True
+        load_instance = False
         fields = ('id', 'judul', 'status', 'prioritas', 'deadline', 'created_at', 'updated_at')
 
     # Desired field order: id, judul, status, prioritas, deadline, created_at, updated_at
     id = fields.Int(dump_only=True)
-    judul = fields.Str(required=True, validate=lambda x: len(x.strip()) > 0)
+    judul = fields.Str(required=True)  # Emptiness is checked by validate_judul
     status = fields.Bool()
     prioritas = fields.Str(required=False)
-    deadline = fields.Date(allow_none=True)
+    deadline = fields.Date(
+        allow_none=True, error_messages={"invalid": ERROR_MESSAGES["invalid_deadline"]}
+    )
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
@@ -36,14 +35,6 @@ class TodoSchema(SQLAlchemyAutoSchema):
         if value and value.capitalize() not in PRIORITIES:
             raise ValidationError(ERROR_MESSAGES["invalid_priority"])
 
-    @validates("deadline")
-    def validate_deadline(self, value: Any, **kwargs) -> None:
-        """
-        Validate deadline format.
-        """
-        if value and not isinstance(value, datetime.date):
-            raise ValidationError(ERROR_MESSAGES["invalid_deadline"])
-
     @validates("judul")
     def validate_judul(self, value: str, **kwargs) -> None:
         """
@@ -52,17 +43,26 @@ class TodoSchema(SQLAlchemyAutoSchema):
         if not value or not value.strip():
             raise ValidationError(ERROR_MESSAGES["empty_title"])
 
-    @post_dump
-    def order_fields(self, data: Dict[str, Any], **kwargs) -> Dict[str, Any]:
-        """
-        Order fields in response with id first and timestamps last.
-        """
-        return {
-            "id": data.get("id"),
-            "judul": data.get("judul"),
-            "status": data.get("status"),
-            "prioritas": data.get("prioritas"),
-            "deadline": data.get("deadline"),
-            "created_at": data.get("created_at"),
-            "updated_at": data.get("updated_at"),
-        }
+
+def dump_todo(todo: Any) -> Dict[str, Any]:
+    """
+    Serialize a Todo into a response dict without going through marshmallow.
+    Fields are ordered with id first and timestamps last. Dates and datetimes
+    are left as-is; the orjson provider encodes them as ISO 8601 strings.
+    """
+    return {
+        "id": todo.id,
+        "judul": todo.judul,
+        "status": todo.status,
+        "prioritas": todo.prioritas,
+        "deadline": todo.deadline,
+        "created_at": todo.created_at,
+        "updated_at": todo.updated_at,
+    }
+
+
+def dump_todos(todos: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Serialize a sequence of Todos.
+    """
+    return [dump_todo(todo) for todo in todos]
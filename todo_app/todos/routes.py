@@ -1,15 +1,17 @@
 import logging
-from flask import Blueprint, request, jsonify, current_app
-from flask_restx import Resource
+import orjson
+from flask import Blueprint, Response, request, jsonify, current_app, g
+from werkzeug.http import generate_etag
 from ..extensions import db
 from ..models import Todo
-from ..schemas import TodoSchema
+from ..schemas import dump_todo
 from ..api_docs import todos_ns
 from ..constants import (
     DEFAULT_PAGE, DEFAULT_PER_PAGE, MAX_PER_PAGE,
     ERROR_MESSAGES, SUCCESS_MESSAGES,
     RESPONSE_SUCCESS, RESPONSE_MESSAGE, RESPONSE_DATA, RESPONSE_COUNT, RESPONSE_PAGINATION,
-    PRIORITIES, HTTP_STATUS
+    HTTP_OK, HTTP_CREATED, HTTP_NO_CONTENT,
+    HTTP_BAD_REQUEST, HTTP_NOT_FOUND, HTTP_CONFLICT, HTTP_INTERNAL_SERVER_ERROR
 )
 from marshmallow import ValidationError
 from typing import Dict, Any, Optional
@@ -21,37 +23,51 @@ bp = Blueprint("todos", __name__)
 # Set up logger
 logger = logging.getLogger(__name__)
 
-todo_schema = TodoSchema(session=db.session)
-todos_schema = TodoSchema(many=True, session=db.session)
-
 
 def build_pagination_response(
     items: Any,
-    pagination_obj: Any,
+    pagination: Dict[str, Any],
+    count: int,
     success: bool = True,
     message: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Build a standardized pagination response.
+    The pagination dict from TodoService is passed through as-is.
     """
     response = {
         RESPONSE_SUCCESS: success,
-        RESPONSE_COUNT: len(items),
+        RESPONSE_COUNT: count,
         RESPONSE_DATA: items,
-        RESPONSE_PAGINATION: {
-            "page": pagination_obj.page,
-            "per_page": pagination_obj.per_page,
-            "total": pagination_obj.total,
-            "pages": pagination_obj.pages,
-            "has_next": pagination_obj.has_next,
-            "has_prev": pagination_obj.has_prev,
-        }
+        RESPONSE_PAGINATION: pagination,
     }
     if message:
         response[RESPONSE_MESSAGE] = message
     return response
 
 
+# Error bodies never change, so they are encoded once at import time
+ERROR_BODIES = {
+    key: orjson.dumps({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: message})
+    for key, message in ERROR_MESSAGES.items()
+}
+
+
+def error_response(key: str, status: int) -> Response:
+    """
+    Build an error response from a pre-encoded ERROR_MESSAGES body.
+    A new Response is created each time since after_request hooks mutate it.
+    """
+    return current_app.response_class(ERROR_BODIES[key], status=status, mimetype="application/json")
+
+
+def build_etag(*parts: Any) -> str:
+    """
+    Build an ETag from values that identify a response's content.
+    """
+    return generate_etag(repr(parts).encode("utf-8"))
+
+
 # Centralized error handler
 @bp.app_errorhandler(ValidationError)
 def handle_validation_error(error):
@@ -61,27 +77,19 @@ def handle_validation_error(error):
         RESPONSE_MESSAGE: ERROR_MESSAGES["validation_error"],
         "errors": error.messages
     }
-    return jsonify(response), HTTP_STATUS["BAD_REQUEST"]
+    return jsonify(response), HTTP_BAD_REQUEST
 
 
 @bp.app_errorhandler(404)
 def handle_404_error(error):
     logger.warning(f"Not found: {error}")
-    response = {
-        RESPONSE_SUCCESS: False,
-        RESPONSE_MESSAGE: ERROR_MESSAGES["todo_not_found"]
-    }
-    return jsonify(response), HTTP_STATUS["NOT_FOUND"]
+    return error_response("todo_not_found", HTTP_NOT_FOUND)
 
 
 @bp.app_errorhandler(500)
 def handle_500_error(error):
     logger.error(f"Internal server error: {error}")
-    response = {
-        RESPONSE_SUCCESS: False,
-        RESPONSE_MESSAGE: ERROR_MESSAGES["internal_error"]
-    }
-    return jsonify(response), HTTP_STATUS["INTERNAL_SERVER_ERROR"]
+    return error_response("internal_error", HTTP_INTERNAL_SERVER_ERROR)
 
 
 # Get all todos
@@ -89,42 +97,45 @@ def handle_500_error(error):
 @todos_ns.doc('list_todos',
     responses={
         200: 'Success - Returns paginated list of todos',
+        304: 'Not Modified - Matches If-None-Match ETag',
         400: 'Bad Request - Invalid pagination parameters'
     },
     params={
         'page': {'description': 'Page number (default: 1)', 'type': 'integer', 'default': 1},
-        'per_page': {'description': 'Items per page (default: 10, max: 100)', 'type': 'integer', 'default': 10}
+        'per_page': {'description': 'Items per page (default: 10, max: 100)', 'type': 'integer', 'default': 10},
+        'cursor': {'description': 'Keyset cursor from pagination.next_cursor; overrides page', 'type': 'string'}
     })
 def list_todos():
     """
     Get list of all todos, ordered by creation time descending.
     Response body ordered with id first and timestamps last.
-    Supports pagination with query parameters page and per_page.
+    Supports pagination with query parameters page and per_page,
+    or keyset pagination with the cursor returned in pagination.next_cursor.
     """
     try:
         page, per_page = TodoService.validate_pagination_params(
             request.args.get("page"), request.args.get("per_page")
         )
+        cursor = TodoService.decode_cursor(request.args.get("cursor"))
     except ValueError as e:
         logger.warning(f"Invalid pagination params: {e}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(e)}), HTTP_STATUS["BAD_REQUEST"]
+        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(e)}), HTTP_BAD_REQUEST
 
-    result = TodoService.get_all_todos(page=page, per_page=per_page)
+    # Every write bumps the list version, so a matching ETag means the client's
+    # copy is current and the page query and serialization can be skipped
+    etag = build_etag(TodoService.get_list_version(), page, per_page, request.args.get("cursor"))
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class()
+        response.set_etag(etag)
+        return response.make_conditional(request)
 
-    # Create a simple object to mimic pagination object
-    class PaginationObj:
-        def __init__(self, pagination_data):
-            self.page = pagination_data["page"]
-            self.per_page = pagination_data["per_page"]
-            self.total = pagination_data["total"]
-            self.pages = pagination_data["pages"]
-            self.has_next = pagination_data["has_next"]
-            self.has_prev = pagination_data["has_prev"]
+    result = TodoService.get_all_todos(page=page, per_page=per_page, cursor=cursor)
 
-    pagination_obj = PaginationObj(result["pagination"])
-    response = build_pagination_response(result["todos"], pagination_obj)
+    response = jsonify(build_pagination_response(result["todos"], result["pagination"], result["count"]))
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
 
-    return jsonify(response), HTTP_STATUS["OK"]
+    return response, HTTP_OK
 
 
 # Create new todo
@@ -132,7 +143,8 @@ def list_todos():
 @todos_ns.doc('create_todo',
     responses={
         201: 'Created - Todo successfully created',
-        400: 'Bad Request - Invalid input data or duplicate title',
+        400: 'Bad Request - Invalid input data',
+        409: 'Conflict - A todo with the same title already exists',
         500: 'Internal Server Error - Database error'
     },
     body=todos_ns.models['Todo'])
@@ -143,26 +155,30 @@ def create_todo():
     """
     Create a new todo based on the JSON data sent.
     """
-    json_data = request.get_json()
+    # Parsed and sanitized once by require_json_data
+    json_data = g.get("json_data")
     if not json_data:
         logger.warning("No input provided for create todo")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: ERROR_MESSAGES["no_input"]}), HTTP_STATUS["BAD_REQUEST"]
+        return error_response("no_input", HTTP_BAD_REQUEST)
 
     try:
         todo = TodoService.create_todo(json_data)
         current_app.logger.info(f"Created todo: {todo.judul}")
-        todo_data = todo_schema.dump(todo)
-        return jsonify(todo_data), HTTP_STATUS["CREATED"]
+        todo_data = dump_todo(todo)
+        return jsonify(todo_data), HTTP_CREATED
     except ValueError as ve:
+        if str(ve) == ERROR_MESSAGES["duplicate_title"]:
+            logger.warning(f"Duplicate title in create todo: {json_data.get('judul')}")
+            return error_response("duplicate_title", HTTP_CONFLICT)
         logger.warning(f"Validation error in create todo: {ve}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_STATUS["BAD_REQUEST"]
+        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_BAD_REQUEST
     except ValidationError as err:
         logger.warning(f"Validation error in create todo: {err.messages}")
-        return jsonify(err.messages), HTTP_STATUS["BAD_REQUEST"]
+        return jsonify(err.messages), HTTP_BAD_REQUEST
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error creating todo: {e}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: ERROR_MESSAGES["database_error"]}), HTTP_STATUS["INTERNAL_SERVER_ERROR"]
+        return error_response("database_error", HTTP_INTERNAL_SERVER_ERROR)
 
 
 # Get todo by ID
@@ -170,6 +186,7 @@ def create_todo():
 @todos_ns.doc('get_todo',
     responses={
         200: 'Success - Returns todo data',
+        304: 'Not Modified - Matches If-None-Match ETag',
         404: 'Not Found - Todo with specified ID not found'
     },
     params={
@@ -181,16 +198,15 @@ def get_todo(todo_id: int):
     """
     try:
         todo = TodoService.get_todo_by_id(todo_id)
-        result = todo_schema.dump(todo)
+        result = dump_todo(todo)
         current_app.logger.info(f"Retrieved todo: {todo_id}")
-        return jsonify(result), HTTP_STATUS["OK"]
-    except Exception as e:
+        response = jsonify(result)
+        response.add_etag()
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    except ValueError:
         logger.warning(f"Todo not found: {todo_id}")
-        response = {
-            RESPONSE_SUCCESS: False,
-            RESPONSE_MESSAGE: ERROR_MESSAGES["todo_not_found"]
-        }
-        return jsonify(response), HTTP_STATUS["NOT_FOUND"]
+        return error_response("todo_not_found", HTTP_NOT_FOUND)
 
 
 # Update todo (PUT/PATCH)
@@ -200,6 +216,7 @@ def get_todo(todo_id: int):
         200: 'Success - Todo successfully updated',
         400: 'Bad Request - Invalid input data or no data provided',
         404: 'Not Found - Todo with specified ID not found',
+        409: 'Conflict - A todo with the same title already exists',
         500: 'Internal Server Error - Database error'
     },
     params={
@@ -213,32 +230,36 @@ def update_todo(todo_id: int):
     """
     Update todo by ID with JSON data sent.
     """
-    json_data = request.get_json() or {}
+    # Parsed and sanitized once by require_json_data
+    json_data = g.get("json_data") or {}
 
     # Check if at least one field is provided for update
     if not json_data:
         logger.warning(f"No data provided for update: {todo_id}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: ERROR_MESSAGES["no_data_for_update"]}), HTTP_STATUS["BAD_REQUEST"]
+        return error_response("no_data_for_update", HTTP_BAD_REQUEST)
 
     try:
         updated = TodoService.update_todo(todo_id, json_data)
         current_app.logger.info(f"Updated todo: {todo_id}")
-        updated_data = todo_schema.dump(updated)
-        return jsonify(updated_data), HTTP_STATUS["OK"]
+        updated_data = dump_todo(updated)
+        return jsonify(updated_data), HTTP_OK
     except ValueError as ve:
-        if "not found" in str(ve).lower():
+        if str(ve) == ERROR_MESSAGES["todo_not_found"]:
             logger.warning(f"Todo {todo_id} not found for update")
-            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_STATUS["NOT_FOUND"]
+            return error_response("todo_not_found", HTTP_NOT_FOUND)
+        elif str(ve) == ERROR_MESSAGES["duplicate_title"]:
+            logger.warning(f"Duplicate title in update todo {todo_id}")
+            return error_response("duplicate_title", HTTP_CONFLICT)
         else:
             logger.warning(f"Validation error in update todo {todo_id}: {ve}")
-            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_STATUS["BAD_REQUEST"]
+            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_BAD_REQUEST
     except ValidationError as err:
         logger.warning(f"Validation error in update todo {todo_id}: {err.messages}")
-        return jsonify(err.messages), HTTP_STATUS["BAD_REQUEST"]
+        return jsonify(err.messages), HTTP_BAD_REQUEST
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error updating todo {todo_id}: {e}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: ERROR_MESSAGES["database_error"]}), HTTP_STATUS["INTERNAL_SERVER_ERROR"]
+        return error_response("database_error", HTTP_INTERNAL_SERVER_ERROR)
 
 
 # Delete todo by ID
@@ -259,18 +280,18 @@ def delete_todo(todo_id: int):
     try:
         TodoService.delete_todo(todo_id)
         current_app.logger.info(f"Deleted todo: {todo_id}")
-        return "", HTTP_STATUS["NO_CONTENT"]
+        return "", HTTP_NO_CONTENT
     except ValueError as ve:
-        if "not found" in str(ve).lower():
+        if str(ve) == ERROR_MESSAGES["todo_not_found"]:
             logger.warning(f"Todo {todo_id} not found for deletion")
-            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_STATUS["NOT_FOUND"]
+            return error_response("todo_not_found", HTTP_NOT_FOUND)
         else:
             logger.warning(f"Delete error: {ve}")
-            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_STATUS["BAD_REQUEST"]
+            return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(ve)}), HTTP_BAD_REQUEST
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error deleting todo {todo_id}: {e}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: ERROR_MESSAGES["database_error"]}), HTTP_STATUS["INTERNAL_SERVER_ERROR"]
+        return error_response("database_error", HTTP_INTERNAL_SERVER_ERROR)
 
 
 # Search todos with filters
@@ -278,7 +299,7 @@ def delete_todo(todo_id: int):
 @todos_ns.doc('search_todos',
     responses={
         200: 'Success - Returns filtered and paginated list of todos',
-        400: 'Bad Request - Invalid search parameters'
+        400: 'Bad Request - Invalid search parameters or date format'
     },
     params={
         'q': {'description': 'Search keyword in title (case insensitive)', 'type': 'string'},
@@ -288,7 +309,8 @@ def delete_todo(todo_id: int):
         'deadline_from': {'description': 'Filter by deadline from date (YYYY-MM-DD)', 'type': 'string'},
         'deadline_to': {'description': 'Filter by deadline to date (YYYY-MM-DD)', 'type': 'string'},
         'page': {'description': 'Page number (default: 1)', 'type': 'integer', 'default': 1},
-        'per_page': {'description': 'Items per page (default: 10, max: 100)', 'type': 'integer', 'default': 10}
+        'per_page': {'description': 'Items per page (default: 10, max: 100)', 'type': 'integer', 'default': 10},
+        'cursor': {'description': 'Keyset cursor from pagination.next_cursor; overrides page', 'type': 'string'}
     })
 def search_todo():
     """
@@ -299,21 +321,23 @@ def search_todo():
     - deadline: exact deadline date (YYYY-MM-DD)
     - deadline_from: deadline from date (YYYY-MM-DD)
     - deadline_to: deadline to date (YYYY-MM-DD)
+    - cursor: keyset cursor from pagination.next_cursor
     """
     kata_kunci = request.args.get("q", "").lower()
     prioritas = request.args.get("prioritas", "").capitalize()
     status = request.args.get("status", "").lower()
-    deadline = request.args.get("deadline", "")
-    deadline_from = request.args.get("deadline_from", "")
-    deadline_to = request.args.get("deadline_to", "")
 
     try:
+        deadline = TodoService.parse_date(request.args.get("deadline"))
+        deadline_from = TodoService.parse_date(request.args.get("deadline_from"))
+        deadline_to = TodoService.parse_date(request.args.get("deadline_to"))
         page, per_page = TodoService.validate_pagination_params(
             request.args.get("page"), request.args.get("per_page")
         )
+        cursor = TodoService.decode_cursor(request.args.get("cursor"))
     except ValueError as e:
-        logger.warning(f"Invalid pagination params in search: {e}")
-        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(e)}), HTTP_STATUS["BAD_REQUEST"]
+        logger.warning(f"Invalid search params: {e}")
+        return jsonify({RESPONSE_SUCCESS: False, RESPONSE_MESSAGE: str(e)}), HTTP_BAD_REQUEST
 
     result = TodoService.search_todos(
         query=kata_kunci,
@@ -323,21 +347,11 @@ def search_todo():
         deadline_from=deadline_from,
         deadline_to=deadline_to,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
 
-    # Create a simple object to mimic pagination object
-    class PaginationObj:
-        def __init__(self, pagination_data):
-            self.page = pagination_data["page"]
-            self.per_page = pagination_data["per_page"]
-            self.total = pagination_data["total"]
-            self.pages = pagination_data["pages"]
-            self.has_next = pagination_data["has_next"]
-            self.has_prev = pagination_data["has_prev"]
-
-    pagination_obj = PaginationObj(result["pagination"])
-    response = build_pagination_response(result["todos"], pagination_obj)
-
-    current_app.logger.info(f"Searched todos: page {page}, per_page {per_page}, count {len(result['todos'])}")
-    return jsonify(response), HTTP_STATUS["OK"]
+    response = build_pagination_response(result["todos"], result["pagination"], result["count"])
+
+    current_app.logger.info(f"Searched todos: page {page}, per_page {per_page}, count {result['count']}")
+    return jsonify(response), HTTP_OK
@@ -2,20 +2,32 @@
 Service layer for Todo business logic.
 Handles all CRUD operations and business rules.
 """
+import base64
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import math
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, Select, delete, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db
-from ..models import Todo
-from ..schemas import TodoSchema
+from ..models import Todo, TodoListVersion
+from ..schemas import TodoSchema, dump_todos
 from ..constants import (
     DEFAULT_PAGE, DEFAULT_PER_PAGE, MAX_PER_PAGE,
-    ERROR_MESSAGES, PRIORITIES
+    ERROR_MESSAGES, PRIORITIES, STATUS_COMPLETED, STATUS_PENDING
 )
 
 logger = logging.getLogger(__name__)
 
-todo_schema = TodoSchema(session=db.session)
-todos_schema = TodoSchema(many=True, session=db.session)
+# Validates payloads into plain dicts; stateless, so safe to share across requests
+todo_schema = TodoSchema()
+
+# Columns selected by list/search queries; rows are serialized directly
+# instead of being hydrated into ORM objects
+TODO_COLUMNS = (
+    Todo.id, Todo.judul, Todo.status, Todo.prioritas,
+    Todo.deadline, Todo.created_at, Todo.updated_at,
+)
 
 
 class TodoService:
@@ -43,27 +55,140 @@ class TodoService:
         return page_int, per_page_int
 
     @staticmethod
-    def get_all_todos(page: int = DEFAULT_PAGE, per_page: int = DEFAULT_PER_PAGE) -> Dict[str, Any]:
+    def parse_date(value: Optional[str]) -> Optional[date]:
         """
-        Get paginated list of all todos.
+        Parse a YYYY-MM-DD query parameter.
+        Returns None when empty, raises ValueError if the format is invalid.
+        """
+        if not value:
+            return None
+
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(ERROR_MESSAGES["invalid_date"])
+
+    @staticmethod
+    def encode_cursor(todo: Any) -> str:
+        """
+        Build an opaque keyset cursor from a todo's (created_at, id).
+        """
+        raw = f"{todo.created_at.isoformat()}|{todo.id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """
+        Decode a cursor produced by encode_cursor.
+        Returns None when no cursor is given, raises ValueError if it is malformed.
+        """
+        if not cursor:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            created_at, todo_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(todo_id)
+        except (ValueError, UnicodeError):
+            raise ValueError(ERROR_MESSAGES["invalid_cursor"])
+
+    @staticmethod
+    def paginate(
+        stmt: Select,
+        page: int,
+        per_page: int,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[Sequence[Row], Dict[str, Any]]:
+        """
+        Paginate a select of TODO_COLUMNS, newest first.
+        With a cursor, uses keyset pagination on (created_at, id), which skips
+        the COUNT and OFFSET queries; page, total and pages are then None.
+        Without a cursor, falls back to page-based pagination.
+        """
+        ordered_stmt = stmt.order_by(Todo.created_at.desc(), Todo.id.desc())
+
+        if cursor is not None:
+            rows = db.session.execute(
+                ordered_stmt.where(tuple_(Todo.created_at, Todo.id) < cursor).limit(per_page + 1)
+            ).all()
+            items = rows[:per_page]
+            has_next = len(rows) > per_page
+            pagination = {
+                "page": None,
+                "per_page": per_page,
+                "total": None,
+                "pages": None,
+                "has_next": has_next,
+                "has_prev": True,
+            }
+        else:
+            # COUNT(*) OVER () returns the total with the page in one round-trip
+            items = db.session.execute(
+                ordered_stmt.add_columns(func.count().over().label("total"))
+                .limit(per_page).offset((page - 1) * per_page)
+            ).all()
+            if items:
+                total = items[0].total
+            elif page > 1:
+                # Past the last page: no rows to carry the window count
+                total = db.session.execute(
+                    select(func.count()).select_from(stmt.subquery())
+                ).scalar_one()
+            else:
+                total = 0
+            pages = math.ceil(total / per_page) if total else 0
+            has_next = page < pages
+            pagination = {
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+                "pages": pages,
+                "has_next": has_next,
+                "has_prev": page > 1,
+            }
+
+        pagination["next_cursor"] = TodoService.encode_cursor(items[-1]) if has_next and items else None
+        return items, pagination
+
+    @staticmethod
+    def get_list_version() -> int:
+        """
+        Current value of the list version counter (a primary-key lookup).
         """
-        pagination = Todo.query.order_by(Todo.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        return db.session.execute(
+            select(TodoListVersion.version).where(TodoListVersion.id == 1)
+        ).scalar_one()
+
+    @staticmethod
+    def bump_list_version() -> None:
+        """
+        Increment the list version; call inside the write's transaction.
+        """
+        db.session.execute(
+            update(TodoListVersion)
+            .where(TodoListVersion.id == 1)
+            .values(version=TodoListVersion.version + 1)
         )
 
-        todos_data = todos_schema.dump(pagination.items)
-        logger.info(f"Retrieved {len(todos_data)} todos (page {page}, per_page {per_page})")
+    @staticmethod
+    def get_all_todos(
+        page: int = DEFAULT_PAGE,
+        per_page: int = DEFAULT_PER_PAGE,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get paginated list of all todos.
+        """
+        items, pagination = TodoService.paginate(select(*TODO_COLUMNS), page, per_page, cursor)
+
+        todos_data = dump_todos(items)
+        count = len(todos_data)
+        logger.info(f"Retrieved {count} todos (page {page}, per_page {per_page})")
 
         return {
             "todos": todos_data,
-            "pagination": {
-                "page": pagination.page,
-                "per_page": pagination.per_page,
-                "total": pagination.total,
-                "pages": pagination.pages,
-                "has_next": pagination.has_next,
-                "has_prev": pagination.has_prev,
-            }
+            "count": count,
+            "pagination": pagination
         }
 
     @staticmethod
@@ -72,59 +197,68 @@ class TodoService:
         Get a single todo by ID.
         Raises ValueError if not found.
         """
-        try:
-            todo = db.get_or_404(Todo, todo_id)
-            logger.info(f"Retrieved todo {todo_id}")
-            return todo
-        except Exception:
+        todo = db.session.get(Todo, todo_id)
+        if todo is None:
             logger.warning(f"Todo {todo_id} not found")
             raise ValueError(ERROR_MESSAGES["todo_not_found"])
 
+        logger.info(f"Retrieved todo {todo_id}")
+        return todo
+
     @staticmethod
     def create_todo(data: Dict[str, Any]) -> Todo:
         """
         Create a new todo.
-        Validates data and checks for duplicates.
+        Validates data; duplicate titles are rejected by the database.
         """
         # Validate required fields
         if not data:
             raise ValueError(ERROR_MESSAGES["no_input"])
 
-        # Check for duplicate title
-        if "judul" in data:
-            existing_todo = Todo.query.filter_by(judul=data["judul"]).first()
-            if existing_todo:
-                raise ValueError(ERROR_MESSAGES["duplicate_title"])
-
         # Load and validate data
-        todo = todo_schema.load(data)
+        todo = Todo(**todo_schema.load(data))
 
-        # Save to database
+        # Save to database; the unique constraint on judul rejects duplicates
         db.session.add(todo)
-        db.session.commit()
+        try:
+            db.session.flush()
+            TodoService.bump_list_version()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning(f"Duplicate title: {todo.judul}")
+            raise ValueError(ERROR_MESSAGES["duplicate_title"])
 
         logger.info(f"Created todo: {todo.judul}")
         return todo
 
     @staticmethod
-    def update_todo(todo_id: int, data: Dict[str, Any]) -> Todo:
+    def update_todo(todo_id: int, data: Dict[str, Any]) -> Row:
         """
         Update an existing todo.
+        Runs a single UPDATE ... RETURNING; raises ValueError if not found.
         """
         if not data:
             raise ValueError(ERROR_MESSAGES["no_data_for_update"])
 
-        try:
-            todo = db.get_or_404(Todo, todo_id)
-        except Exception:
-            logger.warning(f"Todo {todo_id} not found for update")
-            raise ValueError(ERROR_MESSAGES["todo_not_found"])
-
-        # Load and validate update data
-        updated_todo = todo_schema.load(data, instance=todo, partial=True)
+        # Validate the submitted fields only, without loading the row
+        changes = todo_schema.load(data, partial=True)
+        if not changes:
+            raise ValueError(ERROR_MESSAGES["no_data_for_update"])
 
-        # Commit changes
-        db.session.commit()
+        stmt = update(Todo).where(Todo.id == todo_id).values(**changes).returning(*TODO_COLUMNS)
+        try:
+            updated_todo = db.session.execute(stmt).one_or_none()
+            if updated_todo is None:
+                db.session.rollback()
+                logger.warning(f"Todo {todo_id} not found for update")
+                raise ValueError(ERROR_MESSAGES["todo_not_found"])
+            TodoService.bump_list_version()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning(f"Duplicate title in update of todo {todo_id}")
+            raise ValueError(ERROR_MESSAGES["duplicate_title"])
 
         logger.info(f"Updated todo {todo_id}")
         return updated_todo
@@ -133,14 +267,16 @@ class TodoService:
     def delete_todo(todo_id: int) -> None:
         """
         Delete a todo by ID.
+        Runs a single DELETE ... RETURNING; raises ValueError if not found.
         """
-        try:
-            todo = db.get_or_404(Todo, todo_id)
-        except Exception:
+        stmt = delete(Todo).where(Todo.id == todo_id).returning(Todo.id)
+        deleted_id = db.session.execute(stmt).scalar_one_or_none()
+        if deleted_id is None:
+            db.session.rollback()
             logger.warning(f"Todo {todo_id} not found for deletion")
             raise ValueError(ERROR_MESSAGES["todo_not_found"])
 
-        db.session.delete(todo)
+        TodoService.bump_list_version()
         db.session.commit()
 
         logger.info(f"Deleted todo {todo_id}")
@@ -150,54 +286,50 @@ class TodoService:
         query: str = "",
         priority: str = "",
         status: str = "",
-        deadline: str = "",
-        deadline_from: str = "",
-        deadline_to: str = "",
+        deadline: Optional[date] = None,
+        deadline_from: Optional[date] = None,
+        deadline_to: Optional[date] = None,
         page: int = DEFAULT_PAGE,
-        per_page: int = DEFAULT_PER_PAGE
+        per_page: int = DEFAULT_PER_PAGE,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> Dict[str, Any]:
         """
         Search todos with filters.
+        priority is expected capitalized and status lowercased by the caller.
         """
-        base_query = Todo.query
+        conditions = []
 
         # Apply filters
         if query:
-            base_query = base_query.filter(Todo.judul.ilike(f"%{query}%"))
+            conditions.append(Todo.judul.ilike(f"%{query}%"))
 
-        if priority and priority.capitalize() in PRIORITIES:
-            base_query = base_query.filter_by(prioritas=priority.capitalize())
+        if priority in PRIORITIES:
+            conditions.append(Todo.prioritas == priority)
 
-        if status.lower() in ["completed", "selesai"]:
-            base_query = base_query.filter_by(status=True)
-        elif status.lower() in ["pending", "belum"]:
-            base_query = base_query.filter_by(status=False)
+        if status in {"completed", "selesai"}:
+            conditions.append(Todo.status == STATUS_COMPLETED)
+        elif status in {"pending", "belum"}:
+            conditions.append(Todo.status == STATUS_PENDING)
 
-        if deadline:
-            base_query = base_query.filter_by(deadline=deadline)
+        if deadline is not None:
+            conditions.append(Todo.deadline == deadline)
 
-        if deadline_from:
-            base_query = base_query.filter(Todo.deadline >= deadline_from)
+        if deadline_from is not None:
+            conditions.append(Todo.deadline >= deadline_from)
 
-        if deadline_to:
-            base_query = base_query.filter(Todo.deadline <= deadline_to)
+        if deadline_to is not None:
+            conditions.append(Todo.deadline <= deadline_to)
 
         # Paginate results
-        pagination = base_query.order_by(Todo.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        stmt = select(*TODO_COLUMNS).where(*conditions)
+        items, pagination = TodoService.paginate(stmt, page, per_page, cursor)
 
-        results_data = todos_schema.dump(pagination.items)
-        logger.info(f"Search returned {len(results_data)} todos (page {page}, per_page {per_page})")
+        results_data = dump_todos(items)
+        count = len(results_data)
+        logger.info(f"Search returned {count} todos (page {page}, per_page {per_page})")
 
         return {
             "todos": results_data,
-            "pagination": {
-                "page": pagination.page,
-                "per_page": pagination.per_page,
-                "total": pagination.total,
-                "pages": pagination.pages,
-                "has_next": pagination.has_next,
-                "has_prev": pagination.has_prev,
-            }
+            "count": count,
+            "pagination": pagination
         }